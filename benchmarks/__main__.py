@@ -0,0 +1,95 @@
+"""
+Performance regression benchmarks.
+
+    python -m benchmarks run -o results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.2
+
+`run` works headlessly against a scratch SQLite database and stubbed Discord objects.
+`compare` exits with status 1 when any benchmark got slower than the threshold allows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+
+def run(args: argparse.Namespace) -> int:
+    directory = tempfile.mkdtemp(prefix="cah-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+pool:///{os.path.join(directory, 'cards.db')}"
+    try:
+        from benchmarks import suite
+        results = asyncio.run(suite.run(args.scale))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for name, timing in results.items():
+        print(f"{name:32} {timing['median'] * 1e6:12.1f} µs")
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "scale": args.scale,
+            "results": results,
+        }, f, indent=2)
+    print(f"Saved to {args.output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.results) as f:
+        results = json.load(f)["results"]
+
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline:
+            print(f"{name:32} {'new':>10}")
+            continue
+        ratio = timing[args.statistic] / baseline[name][args.statistic]
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  <-- regression"
+            regressions.append(name)
+        print(f"{name:32} {ratio:9.2f}x{flag}")
+    for name in baseline.keys() - results.keys():
+        print(f"{name:32} {'missing':>10}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and save the timings as JSON")
+    run_parser.add_argument("-o", "--output", default="benchmark_results.json")
+    run_parser.add_argument("--scale", type=float, default=1.0,
+                            help="multiplier for the number of calls per timed batch")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="compare saved timings against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results", nargs="?", default="benchmark_results.json")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="allowed slowdown before a benchmark is flagged, 0.2 meaning 20%%")
+    compare_parser.add_argument("--statistic", choices=["min", "median"], default="min",
+                                help="which per-call time to compare; the minimum is the least noisy")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
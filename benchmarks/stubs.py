@@ -0,0 +1,67 @@
+"""
+Just enough of the Discord objects for games and views to run without a connection.
+"""
+
+
+class FakeAvatar:
+    url: str
+
+    def __init__(self, url: str):
+        self.url = url
+
+
+class FakeUser:
+    id: int
+    display_name: str
+    mention: str
+    display_avatar: FakeAvatar
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.display_name = f"Player {user_id}"
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = FakeAvatar(f"https://cdn.discordapp.com/embed/avatars/{user_id % 5}.png")
+
+
+class FakeMessage:
+    edits: int
+
+    def __init__(self):
+        self.edits = 0
+
+    async def edit(self, *args, **kwargs):
+        self.edits += 1
+        return self
+
+
+class FakeGuild:
+    id: int
+
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+
+
+class FakeThread:
+    jump_url: str
+    sent: int
+
+    def __init__(self):
+        self.jump_url = "https://discord.com/channels/1/2"
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+        return FakeMessage()
+
+    async def delete(self):
+        pass
+
+
+class FakeChannel:
+    guild: FakeGuild
+
+    def __init__(self, guild_id: int):
+        self.guild = FakeGuild(guild_id)
+
+    async def create_thread(self, *args, **kwargs):
+        return FakeThread()
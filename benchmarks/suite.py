@@ -0,0 +1,190 @@
+"""
+The benchmarks themselves. Importing this module initialises `cah.db` from DATABASE_URL,
+so point it at a scratch database first (`python -m benchmarks run` does that).
+"""
+import gc
+import inspect
+import random
+import statistics
+import time
+
+from benchmarks.stubs import FakeUser, FakeThread, FakeChannel
+from cah.cache import deck_cache
+from cah.db import db, Deck, WhiteCard, BlackCard
+from cah.game import Game
+from cah.views import CreateRoomWizard, JoinGameView, StartCardSelectView, SelectCardView, CzarPickWinnerView, \
+    WinnerAnnouncedView
+
+GUILD_ID = 1
+DECKS = 500
+WHITE_CARDS_PER_DECK = 200
+BLACK_CARDS_PER_DECK = 50
+GAME_DECKS = 10
+PLAYERS = 20
+ROOM_SIZES = (5, 20, 50)
+SAMPLES = 15
+
+
+def populate():
+    with db.connection_context(), db.atomic():
+        for i in range(DECKS):
+            deck = Deck.create(name=f"Deck {i}", guild_id=GUILD_ID if i % 2 else None)
+            WhiteCard.insert_many(
+                [{"deck": deck, "text": f"White card {j} of deck {i}"} for j in range(WHITE_CARDS_PER_DECK)]
+            ).execute()
+            BlackCard.insert_many(
+                [{"deck": deck, "text": f"Black card {j} of deck {i}: ____.", "white_card_num": 1 + j % 2}
+                 for j in range(BLACK_CARDS_PER_DECK)]
+            ).execute()
+        Deck.bump_version(*[d.id for d in Deck.select(Deck.id)])
+
+
+def get_game_decks() -> list[Deck]:
+    with db.connection_context():
+        return list(Deck.select().limit(GAME_DECKS))
+
+
+def new_game(decks: list[Deck], players: int = PLAYERS) -> Game:
+    owner = FakeUser(0)
+    game = Game(None, owner, FakeThread(), "Benchmark game", decks)
+    game.max_players = players
+    game.goal_points = 1 << 30
+    game.winner_delay = 0
+    for i in range(players):
+        game.join(FakeUser(i))
+    return game
+
+
+async def started_game(decks: list[Deck], players: int = PLAYERS) -> Game:
+    game = new_game(decks, players)
+    await game.start()
+    return game
+
+
+def play_cards(game: Game):
+    czar = game.get_czar()
+    n = game.black_card.get_white_card_num()
+    for p in game.get_players():
+        if p is not czar:
+            p.round_selected_cards = p.cards[:n]
+
+
+def dealing(game: Game):
+    def deal_white_cards():
+        game.deal_white_cards(game.get_players(), 10)
+        for p in game.get_players():
+            game.deck_white_discard += p.cards
+            p.cards = []
+
+    return deal_white_cards
+
+
+def full_round(game: Game):
+    async def play_round():
+        play_cards(game)
+        await game.update_round_status()
+        await game.round_winner(next(p for p in game.get_players() if p.round_selected_cards))
+
+    return play_round
+
+
+def starting_and_resetting(decks: list[Deck], players: int):
+    async def start_and_reset():
+        game = await started_game(decks, players)
+        game.reset()
+
+    return start_and_reset
+
+
+async def call(fn):
+    result = fn()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def measure(fn, number: int) -> dict:
+    """
+    Times SAMPLES batches of `number` calls, like timeit, and reports the time per call.
+    Batching keeps the clock's resolution and the scheduler's jitter out of microsecond-sized results.
+    """
+    # One untimed batch first, so caches and allocator pools are warm like in a running bot.
+    for _ in range(number):
+        await call(fn)
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(SAMPLES):
+            start = time.perf_counter()
+            for _ in range(number):
+                await call(fn)
+            timings.append((time.perf_counter() - start) / number)
+    finally:
+        gc.enable()
+    return {
+        "number": number,
+        "samples": SAMPLES,
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+    }
+
+
+async def run(scale: float = 1.0) -> dict[str, dict]:
+    """
+    Runs every benchmark and returns their timings in seconds, keyed by name.
+    `scale` multiplies the number of calls in each timed batch.
+    """
+    random.seed(0)
+    populate()
+    decks = get_game_decks()
+
+    def number(n: int) -> int:
+        return max(1, int(n * scale))
+
+    def cold_game():
+        deck_cache.invalidate()
+        return new_game(decks)
+
+    benchmarks = {
+        "game_init_cold": (cold_game, 1),
+        "game_init_warm": (lambda: new_game(decks), 5),
+    }
+
+    game = await started_game(decks)
+
+    # Drawn cards go straight to the discard pile so the deck never runs dry.
+    def draw_white_cards():
+        game.deck_white_discard += game.draw_white_cards(10)
+
+    benchmarks["draw_white_cards"] = (draw_white_cards, 500)
+    benchmarks["draw_black_card"] = (game.draw_black_card, 500)
+
+    # Round turnover per room size, to show whether its cost grows with the room.
+    for players in ROOM_SIZES:
+        benchmarks[f"deal_white_cards[{players}]"] = (dealing(await started_game(decks, players)), 100)
+        benchmarks[f"round_winner[{players}]"] = (full_round(await started_game(decks, players)), 10)
+        benchmarks[f"start_and_reset[{players}]"] = (starting_and_resetting(decks, players), 2)
+
+    view_game = await started_game(decks)
+    play_cards(view_game)
+    player = next(p for p in view_game.get_players() if p is not view_game.get_czar())
+    channel = FakeChannel(GUILD_ID)
+    wizard = CreateRoomWizard(None, channel, view_game.owner)
+    join_view = JoinGameView(view_game)
+    round_view = StartCardSelectView(view_game)
+    select_view = SelectCardView(player, view_game.black_card)
+    czar_view = CzarPickWinnerView(view_game)
+    winner_view = WinnerAnnouncedView(player)
+    benchmarks["embed_create_room_wizard"] = (wizard.get_embed, 200)
+    benchmarks["embed_join_game"] = (join_view.get_embed, 200)
+    benchmarks["embed_start_card_select"] = (round_view.get_embed, 200)
+    benchmarks["embed_select_card"] = (select_view.get_embed, 200)
+    benchmarks["embed_czar_pick_winner"] = (czar_view.get_embed, 200)
+    benchmarks["embed_winner_announced"] = (winner_view.get_embed, 200)
+    benchmarks["create_room_wizard_decks"] = (lambda: CreateRoomWizard(None, channel, view_game.owner), 1)
+
+    results = {}
+    for name, (fn, n) in benchmarks.items():
+        results[name] = await measure(fn, number(n))
+    return results
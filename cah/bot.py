@@ -1,24 +1,29 @@
 import discord
 from discord import User, TextChannel
 
+from cah.cache import deck_cache
 from cah.db import Deck
-from cah.game import Game
+from cah.game import Game, DEFAULT_MAX_PLAYERS
 from cah.views import CreateRoomWizard
 
 
 class Server:
     games: list[Game]
+    max_players: int
 
     def __init__(self) -> None:
         self.games = []
+        self.max_players = DEFAULT_MAX_PLAYERS
 
-    async def new_game(self, owner: User, channel: TextChannel, selected_decks: list[Deck], goal: int):
+    async def new_game(self, owner: User, channel: TextChannel, selected_decks: list[Deck], goal: int,
+                       max_players: int = None):
         name = f"{owner.display_name}'s game"
         thread = await channel.create_thread(
             name=name, type=discord.ChannelType.private_thread
         )
         game = Game(self, owner, thread, name, selected_decks)
         game.goal_points = goal
+        game.max_players = min(max_players or self.max_players, self.max_players)
         game.join(owner)
         self.games.append(game)
         return game
@@ -34,6 +39,7 @@ server = Server()
 @bot.event
 async def on_ready():
     print(f"Logged in as {bot.user}")
+    deck_cache.start_refreshing()
 
 
 @bot.slash_command(description="Create a new game")
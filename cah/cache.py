@@ -0,0 +1,138 @@
+import asyncio
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from cah.db import Deck, WhiteCard, BlackCard, read_db, reading
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_REFRESH_INTERVAL = 30
+
+# Rough footprint of a loaded card model besides its text.
+CARD_OVERHEAD = 400
+
+
+class CachedDeck:
+    deck_id: int
+    version: int
+    white_cards: tuple[WhiteCard, ...]
+    black_cards: tuple[BlackCard, ...]
+    size: int
+
+    def __init__(self, deck_id: int, version: int, white_cards: list[WhiteCard], black_cards: list[BlackCard]):
+        self.deck_id = deck_id
+        self.version = version
+        # Tuples, so that a game's snapshot can never be changed by a later reload.
+        self.white_cards = tuple(white_cards)
+        self.black_cards = tuple(black_cards)
+        self.size = sum(sys.getsizeof(c.text) + CARD_OVERHEAD for c in self.white_cards + self.black_cards)
+
+
+class DeckCache:
+    max_bytes: int
+    size: int
+    entries: OrderedDict[int, CachedDeck]
+    refresher: asyncio.Task | None
+    lock: threading.Lock
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.refresher = None
+        self.lock = threading.Lock()
+
+    def store(self, entry: CachedDeck):
+        with self.lock:
+            self.discard(entry.deck_id)
+            if entry.size > self.max_bytes:
+                return
+            self.entries[entry.deck_id] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def discard(self, deck_id: int):
+        entry = self.entries.pop(deck_id, None)
+        if entry:
+            self.size -= entry.size
+
+    def invalidate(self, deck_id: int = None):
+        with self.lock:
+            if deck_id is None:
+                self.entries.clear()
+                self.size = 0
+            else:
+                self.discard(deck_id)
+
+    def lookup(self, deck_id: int, version: int) -> CachedDeck | None:
+        with self.lock:
+            entry = self.entries.get(deck_id)
+            if entry is None or entry.version != version:
+                return None
+            self.entries.move_to_end(deck_id)
+            return entry
+
+    @staticmethod
+    def get_versions(deck_ids: list[int]) -> dict[int, int]:
+        query = Deck.select(Deck.id, Deck.version).where(Deck.id.in_(deck_ids)).bind(read_db)
+        return {deck_id: version for deck_id, version in query.tuples()}
+
+    @staticmethod
+    def load(versions: dict[int, int]) -> list[CachedDeck]:
+        if not versions:
+            return []
+        white = {deck_id: [] for deck_id in versions}
+        black = {deck_id: [] for deck_id in versions}
+        for card in WhiteCard.select().where(WhiteCard.deck.in_(list(versions))).bind(read_db):
+            white[card.deck_id].append(card)
+        for card in BlackCard.select().where(BlackCard.deck.in_(list(versions))).bind(read_db):
+            black[card.deck_id].append(card)
+        return [CachedDeck(deck_id, version, white[deck_id], black[deck_id]) for deck_id, version in versions.items()]
+
+    def get(self, decks: list[Deck]) -> list[CachedDeck]:
+        deck_ids = [d.id for d in decks]
+        with reading():
+            versions = self.get_versions(deck_ids)
+            found = {}
+            stale = {}
+            for deck_id, version in versions.items():
+                entry = self.lookup(deck_id, version)
+                if entry:
+                    found[deck_id] = entry
+                else:
+                    stale[deck_id] = version
+            for entry in self.load(stale):
+                self.store(entry)
+                found[entry.deck_id] = entry
+        return [found[deck_id] for deck_id in deck_ids if deck_id in found]
+
+    def refresh(self):
+        with self.lock:
+            cached = {deck_id: entry.version for deck_id, entry in self.entries.items()}
+        if not cached:
+            return
+        with reading():
+            versions = self.get_versions(list(cached))
+            for deck_id in cached.keys() - versions.keys():
+                self.invalidate(deck_id)
+            stale = {deck_id: version for deck_id, version in versions.items() if cached[deck_id] != version}
+            for entry in self.load(stale):
+                self.store(entry)
+
+    async def run_refresher(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"Refreshing the deck cache failed: {e!r}")
+
+    def start_refreshing(self, interval: float = DEFAULT_REFRESH_INTERVAL):
+        if self.refresher is None or self.refresher.done():
+            self.refresher = asyncio.create_task(self.run_refresher(interval))
+
+
+deck_cache = DeckCache(int(os.environ.get("DECK_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)))
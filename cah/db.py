@@ -1,6 +1,74 @@
+import datetime
+import os
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
 from peewee import *
+from playhouse.db_url import connect, parse, register_database
+from playhouse.migrate import SchemaMigrator, migrate
+from playhouse.pool import PooledDatabase, PooledSqliteDatabase, PooledPostgresqlDatabase
+
+DEFAULT_DATABASE_URL = "sqlite+pool:///cards.db"
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_STALE_TIMEOUT = 300
+
+# Every table goes through `db`. Card and deck reads may go through `read_db`,
+# which is a separate read-only pool for file-backed SQLite and simply the same
+# database as `db` everywhere else.
+db = DatabaseProxy()
+read_db = DatabaseProxy()
+
+
+class PoolMetrics:
+    checkouts: int
+    returns: int
+    peak_in_use: int
+
+    def __init__(self):
+        self.checkouts = 0
+        self.returns = 0
+        self.peak_in_use = 0
+
+
+class MeteredPoolMixin:
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = PoolMetrics()
+        super().__init__(*args, **kwargs)
 
-db = SqliteDatabase("cards.db")
+    def _connect(self):
+        conn = super()._connect()
+        self.metrics.checkouts += 1
+        self.metrics.peak_in_use = max(self.metrics.peak_in_use, len(self._in_use))
+        return conn
+
+    def _close(self, conn, close_conn=False):
+        if not close_conn and self.conn_key(conn) in self._in_use:
+            self.metrics.returns += 1
+        super()._close(conn, close_conn)
+
+    def get_metrics(self) -> dict[str, int]:
+        return {
+            "checkouts": self.metrics.checkouts,
+            "returns": self.metrics.returns,
+            "peak_in_use": self.metrics.peak_in_use,
+            "in_use": len(self._in_use),
+            "idle": len(self._connections),
+            "max_connections": self._max_connections or 0,
+        }
+
+
+class MeteredPooledSqliteDatabase(MeteredPoolMixin, PooledSqliteDatabase):
+    pass
+
+
+class MeteredPooledPostgresqlDatabase(MeteredPoolMixin, PooledPostgresqlDatabase):
+    pass
+
+
+register_database(MeteredPooledSqliteDatabase, "sqlite+pool")
+register_database(MeteredPooledPostgresqlDatabase, "postgres+pool", "postgresql+pool")
 
 
 class BaseModel(Model):
@@ -11,14 +79,43 @@ class BaseModel(Model):
 class Deck(BaseModel):
     name = CharField()
     guild_id = IntegerField(null=True)
+    version = IntegerField(default=0)
+    updated_at = DateTimeField(default=datetime.datetime.now)
+
+    @classmethod
+    def bump_version(cls, *deck_ids: int):
+        # Card saves and deletes call this themselves, bulk queries on cards have to call it afterwards.
+        cls.update(
+            version=cls.version + 1,
+            updated_at=datetime.datetime.now()
+        ).where(cls.id.in_(deck_ids)).execute()
 
 
-class WhiteCard(BaseModel):
+class CardModel(BaseModel):
+    def save(self, *args, **kwargs):
+        model = type(self)
+        with self._meta.database.atomic():
+            deck_ids = {self.deck_id}
+            # A card moved to another deck changes the deck it leaves as well.
+            if self.id is not None and model.deck in self.dirty_fields:
+                deck_ids.add(model.select(model.deck).where(model.id == self.id).scalar())
+            rows = super().save(*args, **kwargs)
+            Deck.bump_version(*deck_ids)
+        return rows
+
+    def delete_instance(self, *args, **kwargs):
+        with self._meta.database.atomic():
+            rows = super().delete_instance(*args, **kwargs)
+            Deck.bump_version(self.deck_id)
+        return rows
+
+
+class WhiteCard(CardModel):
     deck = ForeignKeyField(Deck, backref="white_cards")
     text = CharField()
 
 
-class BlackCard(BaseModel):
+class BlackCard(CardModel):
     deck = ForeignKeyField(Deck, backref="black_cards")
     text = CharField()
     white_card_num = IntegerField(null=True)
@@ -27,4 +124,87 @@ class BlackCard(BaseModel):
         return self.white_card_num or 1
 
 
-db.create_tables([Deck, WhiteCard, BlackCard])
+def open_database(url: str, max_connections: int = None, stale_timeout: int = None) -> Database:
+    scheme = urlparse(url).scheme
+    params = {}
+    if scheme.endswith("+pool"):
+        # Pool settings in the URL's query string win over the arguments.
+        in_url = parse(url)
+        if "max_connections" not in in_url:
+            params["max_connections"] = max_connections or DEFAULT_MAX_CONNECTIONS
+        if "stale_timeout" not in in_url:
+            params["stale_timeout"] = stale_timeout or DEFAULT_STALE_TIMEOUT
+        # Pooled connections move between threads (the deck cache refreshes in a worker thread).
+        if "sqlite" in scheme and "check_same_thread" not in in_url:
+            params["check_same_thread"] = False
+    return connect(url, **params)
+
+
+def open_read_database(database: Database) -> Database:
+    if not isinstance(database, PooledSqliteDatabase) or database.database in ("", ":memory:"):
+        return database
+    if database.database.startswith("file:"):
+        return database
+    return MeteredPooledSqliteDatabase(
+        f"file:{database.database}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        max_connections=database._max_connections,
+        stale_timeout=database._stale_timeout,
+    )
+
+
+def migrate_tables(database: Database):
+    # Databases created before decks were versioned lack these columns.
+    columns = {c.name for c in database.get_columns(Deck._meta.table_name)}
+    migrator = SchemaMigrator.from_database(database)
+    operations = []
+    for field in (Deck.version, Deck.updated_at):
+        if field.column_name not in columns:
+            operations.append(migrator.add_column(Deck._meta.table_name, field.column_name, field))
+    if operations:
+        migrate(*operations)
+
+
+def init_db(url: str = None, max_connections: int = None, stale_timeout: int = None):
+    if url is None:
+        url = os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL)
+    if max_connections is None and "DATABASE_MAX_CONNECTIONS" in os.environ:
+        max_connections = int(os.environ["DATABASE_MAX_CONNECTIONS"])
+    if stale_timeout is None and "DATABASE_STALE_TIMEOUT" in os.environ:
+        stale_timeout = int(os.environ["DATABASE_STALE_TIMEOUT"])
+
+    if isinstance(db.obj, PooledDatabase):
+        db.obj.close_all()
+    if read_db.obj is not db.obj and isinstance(read_db.obj, PooledDatabase):
+        read_db.obj.close_all()
+
+    database = open_database(url, max_connections, stale_timeout)
+    db.initialize(database)
+    with db.connection_context():
+        db.create_tables([Deck, WhiteCard, BlackCard])
+        migrate_tables(database)
+    read_db.initialize(open_read_database(database))
+
+
+@contextmanager
+def reading():
+    # A connection the thread already holds (autoconnect, an open transaction, or `db` itself
+    # when `read_db` is the same database) is used as is and must stay open afterwards.
+    if not read_db.is_closed():
+        yield
+        return
+    with read_db.connection_context():
+        yield
+
+
+def get_pool_metrics() -> dict[str, dict[str, int]]:
+    metrics = {}
+    if isinstance(db.obj, MeteredPoolMixin):
+        metrics["db"] = db.obj.get_metrics()
+    if read_db.obj is not db.obj and isinstance(read_db.obj, MeteredPoolMixin):
+        metrics["read_db"] = read_db.obj.get_metrics()
+    return metrics
+
+
+init_db()
@@ -12,3 +12,7 @@ class GameInProgressException(Exception):
 
 class PlayerNotFoundError(Exception):
     pass
+
+
+class GameFullException(Exception):
+    pass
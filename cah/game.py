@@ -1,24 +1,31 @@
 import asyncio
+import os
 import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 import discord
 from discord import User, Embed, Color
 
-from cah import db
+from cah.cache import deck_cache
 from cah.db import BlackCard, WhiteCard, Deck
-from cah.exceptions import AlreadyInGameException, NotInGameException, GameInProgressException, PlayerNotFoundError
+from cah.exceptions import AlreadyInGameException, NotInGameException, GameInProgressException, PlayerNotFoundError, \
+    GameFullException
 from cah.player import Player
+from cah.scoreboard import Scoreboard
 from cah.views import StartCardSelectView, GameView, CzarPickWinnerView, WinnerAnnouncedView, JoinGameView
 
 if TYPE_CHECKING:
     from cah.bot import Server
 
 
+DEFAULT_MAX_PLAYERS = int(os.environ.get("MAX_PLAYERS", 50))
+
+
 class Game:
     server: "Server"
     name: str
     players: dict[int, Player]
+    scoreboard: Scoreboard
     owner: discord.User
     channel: discord.Thread
     in_progress: bool
@@ -31,6 +38,8 @@ class Game:
     round: int
     round_view: GameView | None
     goal_points: int
+    max_players: int
+    winner_delay: float = 5
     czar_order = []
     black_card: BlackCard | None = None
 
@@ -43,15 +52,17 @@ class Game:
         self.round = 0
         self.round_view = None
         self.goal_points = 5
+        self.max_players = DEFAULT_MAX_PLAYERS
         self.name = name
+        self.scoreboard = Scoreboard(name)
 
         self.deck_white = []
         self.deck_black = []
         self.deck_white_discard = []
         self.deck_black_discard = []
-        for deck in decks:
-            self.deck_white += [c for c in db.WhiteCard.select().where(db.WhiteCard.deck == deck)]
-            self.deck_black += [c for c in db.BlackCard.select().where(db.BlackCard.deck == deck)]
+        for cached in deck_cache.get(decks):
+            self.deck_white += cached.white_cards
+            self.deck_black += cached.black_cards
 
     def join(self, user: discord.User):
         key = user.id
@@ -59,8 +70,11 @@ class Game:
             raise GameInProgressException()
         if key in self.players:
             raise AlreadyInGameException()
+        if len(self.players) >= self.max_players:
+            raise GameFullException()
         player = Player(user, self)
         self.players[key] = player
+        self.scoreboard.add(player)
 
     def leave(self, user: discord.User):
         key = user.id
@@ -68,7 +82,7 @@ class Game:
             raise GameInProgressException()
         if key not in self.players:
             raise NotInGameException()
-        self.players.pop(key)
+        self.scoreboard.remove(self.players.pop(key))
 
     async def start(self):
         random.shuffle(self.deck_white)
@@ -77,8 +91,7 @@ class Game:
         order = [p for p in self.players.keys()]
         random.shuffle(order)
         self.czar_order = order
-        for p in self.get_players():
-            p.add_cards(self.draw_white_cards(10))
+        self.deal_white_cards(self.get_players(), 10)
         await self.begin_round()
 
     def get_players(self):
@@ -107,24 +120,62 @@ class Game:
     def is_round_ready(self):
         return len(self.get_unfinished_players()) == 0
 
+    def recycle_white_discard(self):
+        random.shuffle(self.deck_white_discard)
+        self.deck_white_discard += self.deck_white
+        self.deck_white = self.deck_white_discard
+        self.deck_white_discard = []
+
     def draw_white_cards(self, n: int = 1):
+        # Drawing from the end keeps the rest of the deck from shifting.
         if n > len(self.deck_white):
-            random.shuffle(self.deck_white_discard)
-            self.deck_white += self.deck_white_discard
-            self.deck_white_discard = []
-        cards = self.deck_white[0:n]
-        del self.deck_white[0:n]
+            self.recycle_white_discard()
+        start = max(len(self.deck_white) - n, 0)
+        cards = self.deck_white[start:]
+        del self.deck_white[start:]
         return cards
 
+    def deal_white_cards(self, players: Iterable[Player], n: int):
+        players = list(players)
+        cards = self.draw_white_cards(n * len(players))
+        for i, player in enumerate(players):
+            player.add_cards(cards[i * n:(i + 1) * n])
+
     def draw_black_card(self):
-        if len(self.deck_black_discard) == 0:
+        if len(self.deck_black) == 0:
             random.shuffle(self.deck_black_discard)
-            self.deck_white += self.deck_black_discard
+            self.deck_black = self.deck_black_discard
             self.deck_black_discard = []
-        head = self.deck_black.pop(0)
+        head = self.deck_black.pop()
         self.deck_black_discard.append(head)
         return head
 
+    def collect_round_cards(self) -> list[Player]:
+        played = []
+        for p in self.get_players():
+            if not p.round_selected_cards:
+                continue
+            self.deck_white_discard += p.take_round_selection()
+            played.append(p)
+        return played
+
+    def reset(self):
+        self.scoreboard.reset()
+        for p in self.get_players():
+            self.deck_white += p.cards
+            p.cards = []
+            p.round_selected_cards = []
+            p.round_selector_view = None
+        self.deck_white += self.deck_white_discard
+        self.deck_black += self.deck_black_discard
+        self.deck_white_discard = []
+        self.deck_black_discard = []
+        self.in_progress = False
+        self.round_view = None
+        self.czar_order = []
+        self.black_card = None
+        self.round = 0
+
     async def join_phase(self):
         view = JoinGameView(self)
 
@@ -158,13 +209,13 @@ class Game:
             await self.round_view.update()
 
     def has_winner(self) -> Player | None:
-        for p in self.get_players():
-            if p.points >= self.goal_points:
-                return p
+        leader = self.scoreboard.get_leader()
+        if leader and leader.points >= self.goal_points:
+            return leader
         return None
 
     async def round_winner(self, selected_player: Player):
-        selected_player.points += 1
+        self.scoreboard.add_points(selected_player)
         container = self.round_view.container
         view = WinnerAnnouncedView(selected_player)
         view.container = container
@@ -172,16 +223,11 @@ class Game:
             embed=view.get_embed(),
             view=view
         )
-        await asyncio.sleep(5)
+        await asyncio.sleep(self.winner_delay)
         winner = self.has_winner()
 
         n = self.black_card.get_white_card_num()
-        for p in self.get_players():
-            self.deck_white_discard += p.round_selected_cards
-            for s in p.round_selected_cards:
-                p.cards.remove(s)
-            p.round_selected_cards = []
-            p.add_cards(self.draw_white_cards(n))
+        self.deal_white_cards(self.collect_round_cards(), n)
 
         if not winner:
             await self.begin_round()
@@ -193,19 +239,7 @@ class Game:
                     color=Color.from_rgb(255, 176, 46)
                 )
             )
-            for p in self.get_players():
-                p.points = 0
-                self.deck_white += p.cards
-                p.cards = []
-            self.deck_white += self.deck_white_discard
-            self.deck_black += self.deck_black_discard
-            self.deck_white_discard = []
-            self.deck_black_discard = []
-            self.in_progress = False
-            self.round_view = None
-            self.czar_order = []
-            self.black_card = None
-            self.round = 0
+            self.reset()
             await self.join_phase()
 
     async def end_game(self):
@@ -29,6 +29,14 @@ class Player:
     def add_cards(self, cards: list[WhiteCard]):
         self.cards += cards
 
+    def take_round_selection(self) -> list[WhiteCard]:
+        selected = self.round_selected_cards
+        if selected:
+            ids = {id(c) for c in selected}
+            self.cards = [c for c in self.cards if id(c) not in ids]
+        self.round_selected_cards = []
+        return selected
+
     def request_card(self):
         self.game.channel.send()
 
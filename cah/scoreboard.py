@@ -0,0 +1,85 @@
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING
+
+from discord import Embed, Color
+from discord.utils import escape_markdown
+
+from cah.views import fit_lines
+
+if TYPE_CHECKING:
+    from cah.player import Player
+
+
+class Scoreboard:
+    title: str
+    standings: list["Player"]
+    join_order: dict[int, int]
+    joined: int
+
+    _players_render: str | None
+    _standings_render: str | None
+    _embed: Embed | None
+
+    def __init__(self, title: str):
+        self.title = title
+        self.standings = []
+        self.join_order = {}
+        self.joined = 0
+        self.invalidate()
+
+    def _key(self, player: "Player"):
+        return -player.points, self.join_order[player.user.id]
+
+    def _index(self, player: "Player") -> int:
+        return bisect_left(self.standings, self._key(player), key=self._key)
+
+    def invalidate(self):
+        self._players_render = None
+        self._standings_render = None
+        self._embed = None
+
+    def add(self, player: "Player"):
+        self.join_order[player.user.id] = self.joined
+        self.joined += 1
+        insort(self.standings, player, key=self._key)
+        self.invalidate()
+
+    def remove(self, player: "Player"):
+        del self.standings[self._index(player)]
+        self.join_order.pop(player.user.id)
+        self.invalidate()
+
+    def add_points(self, player: "Player", n: int = 1):
+        del self.standings[self._index(player)]
+        player.points += n
+        insort(self.standings, player, key=self._key)
+        self.invalidate()
+
+    def reset(self):
+        for p in self.standings:
+            p.points = 0
+        self.standings.sort(key=self._key)
+        self.invalidate()
+
+    def get_leader(self) -> "Player | None":
+        return self.standings[0] if self.standings else None
+
+    def get_player_list(self) -> str:
+        # Only shown while joining, when nobody has points and the standings are in join order.
+        if self._players_render is None:
+            self._players_render = fit_lines([p.user.display_name for p in self.standings])
+        return self._players_render
+
+    def get_standings(self) -> str:
+        if self._standings_render is None:
+            self._standings_render = fit_lines([f"{s.user.mention}: {s.points}" for s in self.standings])
+        return self._standings_render
+
+    def get_embed(self) -> Embed:
+        if self._embed is None:
+            self._embed = Embed(
+                title=escape_markdown(self.title),
+                color=Color.from_rgb(255, 176, 46)
+            )
+            self._embed.add_field(name="🏅 Scoreboard", value=self.get_standings())
+        return self._embed
@@ -5,14 +5,17 @@ from discord import ButtonStyle, Interaction, Embed, Color, EmbedAuthor, EmbedFo
 from discord.ui import View, button, Button, Select
 from discord.utils import escape_markdown
 
-from cah.db import WhiteCard, BlackCard, Deck
-from cah.exceptions import AlreadyInGameException, NotInGameException, PlayerNotFoundError
+from cah.db import WhiteCard, BlackCard, Deck, read_db, reading
+from cah.exceptions import AlreadyInGameException, NotInGameException, PlayerNotFoundError, GameFullException
 
 if TYPE_CHECKING:
     from cah.player import Player
     from cah.game import Game
     from cah.bot import Server
 
+# Discord refuses selects with more options than this.
+SELECT_PAGE_SIZE = 25
+
 
 class GameView(View):
     container: Interaction | Message | None
@@ -30,6 +33,92 @@ class GameView(View):
             await self.container.edit(embed=self.get_embed(), view=self if not remove_view else None)
 
 
+EMBED_FIELD_LIMIT = 1024
+EMBED_FOOTER_LIMIT = 2048
+EMBED_DESCRIPTION_LIMIT = 4096
+
+
+def fit_lines(lines: list[str], limit: int = EMBED_FIELD_LIMIT, separator: str = "\n") -> str:
+    text = separator.join(lines)
+    if len(text) <= limit:
+        return text
+    shown = []
+    length = 0
+    for line in lines:
+        # Leave room for the "…and K more" line.
+        if length + len(line) + len(separator) > limit - 20:
+            break
+        shown.append(line)
+        length += len(line) + len(separator)
+    return separator.join(shown + [f"…and {len(lines) - len(shown)} more"])
+
+
+def shorten_label(label: str) -> str:
+    if len(label) > 97:
+        label = label[0:97] + "..."
+    return label
+
+
+class PagedSelectView(GameView):
+    page: int
+    page_items: list[Select | Button]
+
+    def __init__(self, *items):
+        super().__init__(*items)
+        self.page = 0
+        self.page_items = []
+
+    def get_option_count(self) -> int:
+        ...
+
+    def get_option_label(self, index: int) -> str:
+        ...
+
+    async def option_selected(self, index: int, interaction: Interaction):
+        ...
+
+    async def can_turn_page(self, interaction: Interaction) -> bool:
+        return True
+
+    def get_page_count(self) -> int:
+        return max(1, -(-self.get_option_count() // SELECT_PAGE_SIZE))
+
+    def get_page_range(self) -> range:
+        start = self.page * SELECT_PAGE_SIZE
+        return range(start, min(start + SELECT_PAGE_SIZE, self.get_option_count()))
+
+    def render_page(self):
+        for item in self.page_items:
+            self.remove_item(item)
+        self.page_items = []
+
+        select = Select(row=0)
+        for i in self.get_page_range():
+            select.add_option(label=shorten_label(self.get_option_label(i)), value=str(i))
+        select.callback = lambda _: self.option_selected(int(select.values[0]), _)
+        self.page_items.append(select)
+
+        if self.get_page_count() > 1:
+            previous = Button(emoji="◀️", style=ButtonStyle.gray, row=1, disabled=self.page == 0)
+            previous.callback = lambda _: self.turn_page(-1, _)
+            position = Button(label=f"{self.page + 1}/{self.get_page_count()}", style=ButtonStyle.gray, row=1,
+                              disabled=True)
+            following = Button(emoji="▶️", style=ButtonStyle.gray, row=1,
+                               disabled=self.page + 1 >= self.get_page_count())
+            following.callback = lambda _: self.turn_page(1, _)
+            self.page_items += [previous, position, following]
+
+        for item in self.page_items:
+            self.add_item(item)
+
+    async def turn_page(self, step: int, interaction: Interaction):
+        if not await self.can_turn_page(interaction):
+            return
+        self.page = min(max(self.page + step, 0), self.get_page_count() - 1)
+        self.render_page()
+        await interaction.edit(embed=self.get_embed(), view=self)
+
+
 class CreateRoomWizard(GameView):
     server: "Server"
     channel: TextChannel
@@ -38,6 +127,7 @@ class CreateRoomWizard(GameView):
     available_decks: list[Deck]
     selected_decks: list[Deck]
     phase: int
+    goal: int
     game: "Game"
 
     def get_embed(self) -> Embed:
@@ -50,6 +140,10 @@ class CreateRoomWizard(GameView):
                 title="Select the goal number of points that must be reached to win."
             )
         if self.phase == 2:
+            return Embed(
+                title="Select the maximum number of players."
+            )
+        if self.phase == 3:
             return Embed(
                 title=f"👍 Done. See this channel: {self.game.channel.jump_url}"
             )
@@ -63,17 +157,19 @@ class CreateRoomWizard(GameView):
         self.available_decks = []
         self.selected_decks = []
         super().__init__()
+        with reading():
+            query = Deck.select().where((Deck.guild_id == self.channel.guild.id) | (Deck.guild_id == None))
+            for deck in query.bind(read_db):
+                self.available_decks.append(deck)
         self.create_selector()
 
     def create_selector(self):
         self.phase = 0
         self.clear_items()
         select = Select()
-        for deck in Deck.select().where((Deck.guild_id == self.channel.guild.id) | (Deck.guild_id == None)):
-            self.available_decks.append(deck)
         max_values = 0
-        for i in range(25):
-            index = self.deck_page * 25 + i
+        for i in range(SELECT_PAGE_SIZE):
+            index = self.deck_page * SELECT_PAGE_SIZE + i
             if index >= len(self.available_decks):
                 break
             deck = self.available_decks[index]
@@ -87,7 +183,7 @@ class CreateRoomWizard(GameView):
     async def deck_selection_made(self, select: Select, interaction: Interaction):
         self.container = interaction
         self.selected_decks += [self.available_decks[int(k)] for k in select.values]
-        if (len(self.available_decks) - 1) // 25 > self.deck_page:
+        if (len(self.available_decks) - 1) // SELECT_PAGE_SIZE > self.deck_page:
             self.deck_page += 1
             self.create_selector()
             await self.update()
@@ -106,9 +202,25 @@ class CreateRoomWizard(GameView):
 
     async def selected_goal(self, select: Select, interaction: Interaction):
         self.container = interaction
-        goal = int(select.values[0])
+        self.goal = int(select.values[0])
+        self.create_max_players_picker()
+        await self.update()
+
+    def create_max_players_picker(self):
         self.phase = 2
-        game = await self.server.new_game(self.owner, self.channel, self.selected_decks, goal)
+        self.clear_items()
+        select = Select()
+        limit = self.server.max_players
+        for i in [n for n in (3, 5, 10, 15, 20, 25, 30, 40, 50, 75, 100) if n < limit] + [limit]:
+            select.add_option(label=str(i), value=str(i), default=i == limit)
+        select.callback = lambda _: self.selected_max_players(select, _)
+        self.add_item(select)
+
+    async def selected_max_players(self, select: Select, interaction: Interaction):
+        self.container = interaction
+        max_players = int(select.values[0])
+        self.phase = 3
+        game = await self.server.new_game(self.owner, self.channel, self.selected_decks, self.goal, max_players)
         self.game = game
         await game.join_phase()
         await self.update(True)
@@ -130,9 +242,7 @@ class JoinGameView(GameView):
                         + f"**{self.game.owner.display_name}**, click the 'start' once everybody has joined.",
         )
 
-        embed.add_field(name="Players", value="\n".join(
-            [p.user.display_name for p in self.game.players.values()]
-        ))
+        embed.add_field(name="Players", value=self.game.scoreboard.get_player_list())
 
         return embed
 
@@ -145,6 +255,11 @@ class JoinGameView(GameView):
                 "❌ You have already joined this game!", ephemeral=True
             )
             return
+        except GameFullException:
+            await interaction.respond(
+                f"❌ This game is full! ({self.game.max_players} players)", ephemeral=True
+            )
+            return
 
         await interaction.respond(
             "✅🎮 You have successfully joined!", ephemeral=True
@@ -215,6 +330,19 @@ def get_card_list(cards: list[WhiteCard], selected: list[WhiteCard] = None, sele
     return "\n".join(card_list)
 
 
+def create_standings_button(game: "Game", row: int = None) -> Button:
+    button = Button(label="Standings", style=ButtonStyle.gray, emoji="🏅", row=row)
+
+    async def show_standings(interaction: Interaction):
+        await interaction.respond(
+            embed=game.scoreboard.get_embed(),
+            ephemeral=True
+        )
+
+    button.callback = show_standings
+    return button
+
+
 class StartCardSelectView(GameView):
     game: "Game"
 
@@ -222,7 +350,7 @@ class StartCardSelectView(GameView):
         self.game = game
         button = Button(label=f"Select {self.game.black_card.get_white_card_num()} card(s)", style=ButtonStyle.gray)
         button.callback = self.select_cards
-        super().__init__(button)
+        super().__init__(button, create_standings_button(game))
 
     def get_embed(self) -> Embed:
         czar = self.game.get_czar()
@@ -236,7 +364,8 @@ class StartCardSelectView(GameView):
                 icon_url=czar.user.display_avatar.url
             ),
             footer=EmbedFooter(
-                text=("Still waiting for: " + ", ".join(unfinished)) if len(unfinished) > 0 else "Ready!"
+                text=("Still waiting for: " + fit_lines(unfinished, EMBED_FOOTER_LIMIT - 19, ", "))
+                if len(unfinished) > 0 else "Ready!"
             )
         )
         return embed
@@ -277,7 +406,7 @@ class StartCardSelectView(GameView):
         )
 
 
-class SelectCardView(GameView):
+class SelectCardView(PagedSelectView):
     player: "Player"
     black_card: BlackCard
     to_select: int
@@ -288,14 +417,17 @@ class SelectCardView(GameView):
         self.black_card = black_card
         self.selected = []
         self.to_select = black_card.get_white_card_num()
-        select = Select()
-        for i, card in enumerate(player.cards):
-            label = card.text
-            if len(label) > 97:
-                label = label[0:97] + "..."
-            select.add_option(label=label, value=str(i))
-        select.callback = lambda _: self.select_card(select, _)
-        super().__init__(select)
+        super().__init__()
+        self.render_page()
+
+    def get_option_count(self) -> int:
+        return len(self.player.cards)
+
+    def get_option_label(self, index: int) -> str:
+        return self.player.cards[index].text
+
+    async def option_selected(self, index: int, interaction: Interaction):
+        await self.select_card(index, interaction)
 
     def get_embed(self) -> Embed:
         embed = Embed(
@@ -312,9 +444,9 @@ class SelectCardView(GameView):
             )
         return embed
 
-    async def select_card(self, select: Select, interaction: Interaction):
+    async def select_card(self, index: int, interaction: Interaction):
         self.container = interaction
-        selected_card = self.player.cards[int(select.values[0])]
+        selected_card = self.player.cards[index]
         if selected_card not in self.selected:
             self.selected.append(selected_card)
             self.to_select -= 1
@@ -334,7 +466,7 @@ class SelectCardView(GameView):
             await self.container.edit(content="➡️ Moved", embed=None, view=None)
 
 
-class CzarPickWinnerView(GameView):
+class CzarPickWinnerView(PagedSelectView):
     game: "Game"
     players_cards: list["Player"]
 
@@ -343,17 +475,24 @@ class CzarPickWinnerView(GameView):
         czar = game.get_czar()
         self.players_cards = [p for p in game.get_players() if p != czar]
         random.shuffle(self.players_cards)
-        select = Select()
-        for i, player in enumerate(self.players_cards):
-            label = ", ".join([p.text for p in player.round_selected_cards])
-            if len(label) > 97:
-                label = label[0:97] + "..."
-            select.add_option(label=label, value=str(i))
-        select.callback = lambda _: self.select_winner(select, _)
+        # Rows 0 and 1 belong to the select and its page buttons.
+        super().__init__(create_standings_button(game, 2))
+        self.render_page()
+
+    def get_option_count(self) -> int:
+        return len(self.players_cards)
+
+    def get_option_label(self, index: int) -> str:
+        return ", ".join([p.text for p in self.players_cards[index].round_selected_cards])
 
-        super().__init__(select)
+    async def option_selected(self, index: int, interaction: Interaction):
+        await self.select_winner(index, interaction)
 
-    async def select_winner(self, select: Select, interaction: Interaction):
+    async def can_turn_page(self, interaction: Interaction) -> bool:
+        # The page is shared by everyone in the channel, so only the czar flips it.
+        return await self.check_czar(interaction)
+
+    async def check_czar(self, interaction: Interaction) -> bool:
         try:
             player = self.game.get_player(interaction.user)
         except PlayerNotFoundError:
@@ -361,35 +500,47 @@ class CzarPickWinnerView(GameView):
                 "❌ You are not a player!",
                 ephemeral=True
             )
-            return
+            return False
 
         if player != self.game.get_czar():
             await interaction.respond(
                 "❌ You are not the Card Czar!",
                 ephemeral=True
             )
+            return False
+
+        return True
+
+    async def select_winner(self, index: int, interaction: Interaction):
+        if not await self.check_czar(interaction):
             return
 
-        selected_player = self.players_cards[int(select.values[0])]
+        selected_player = self.players_cards[index]
         await self.game.round_winner(selected_player)
 
-    def get_player_card_list(self):
+    def get_player_card_list(self, limit: int = EMBED_DESCRIPTION_LIMIT):
         l = []
-        for p in self.players_cards:
+        for i in self.get_page_range():
+            p = self.players_cards[i]
             l.append("## ◽ " + ", ◽ ".join([escape_markdown(k.text) for k in p.round_selected_cards]))
-        return "\n".join(l)
+        return fit_lines(l, limit)
 
     def get_embed(self) -> Embed:
         czar = self.game.get_czar()
+        header = f"# {escape_markdown(self.game.black_card.text)}\n"
         embed = Embed(
             title=f"Round {self.game.round}",
-            description=f"# {escape_markdown(self.game.black_card.text)}\n" + self.get_player_card_list(),
+            description=header + self.get_player_card_list(EMBED_DESCRIPTION_LIMIT - len(header)),
             color=Color.from_rgb(0, 0, 0),
             author=EmbedAuthor(
                 name=f"{czar.user.display_name} is the 👑 Czar",
                 icon_url=czar.user.display_avatar.url
             )
         )
+        if self.get_page_count() > 1:
+            embed.footer = EmbedFooter(
+                text=f"Page {self.page + 1} of {self.get_page_count()}"
+            )
         return embed
 
 
@@ -413,10 +564,8 @@ class WinnerAnnouncedView(GameView):
                 icon_url=czar.user.display_avatar.url
             )
         )
-        scoreboard = list(self.player.game.get_players())
-        scoreboard.sort(key=lambda k: k.points, reverse=True)
         embed.add_field(
             name="🏅 Scoreboard",
-            value="\n".join([f"{s.user.mention}: {s.points}" for s in scoreboard])
+            value=self.player.game.scoreboard.get_standings()
         )
         return embed
@@ -1,7 +1,8 @@
 from dotenv import load_dotenv
 import os
-from cah.bot import bot
 
 load_dotenv()
 
+from cah.bot import bot
+
 bot.run(os.environ.get("TOKEN"))
@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# A Postgres DATABASE_URL is kept for the tests that need it; everything else,
+# including the import-time init_db() of cah.db, runs against a scratch SQLite file.
+url = os.environ.get("DATABASE_URL", "")
+if url.startswith("postgres"):
+    os.environ["POSTGRES_URL"] = url
+os.environ["DATABASE_URL"] = f"sqlite+pool:///{os.path.join(tempfile.mkdtemp(prefix='cah-test-'), 'cards.db')}"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def sqlite_file(tmp_path):
+    from cah import db
+    db.init_db(f"sqlite+pool:///{tmp_path / 'cards.db'}")
+    yield
+    db.init_db()
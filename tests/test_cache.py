@@ -0,0 +1,47 @@
+import asyncio
+
+from cah import db
+from cah.cache import DeckCache
+from cah.db import Deck, WhiteCard
+
+
+def test_threaded_refresh_then_get(sqlite_file):
+    with db.db.connection_context():
+        deck = Deck.create(name="Deck")
+        card = WhiteCard.create(deck=deck, text="Card")
+    cache = DeckCache()
+    cache.get([deck])
+
+    with db.db.connection_context():
+        card.text = "Edited"
+        card.save()
+    asyncio.run(asyncio.to_thread(cache.refresh))
+    assert [c.text for c in cache.get([deck])[0].white_cards] == ["Edited"]
+
+
+def test_get_reuses_connection_from_refresh_thread(sqlite_file):
+    with db.db.connection_context():
+        deck = Deck.create(name="Deck")
+    cache = DeckCache()
+    cache.get([deck])
+    # Leave only a connection opened by the worker thread in the pool.
+    db.read_db.obj.close_idle()
+    asyncio.run(asyncio.to_thread(cache.refresh))
+    assert cache.get([deck])[0].deck_id == deck.id
+
+
+def test_moving_card_invalidates_both_decks(sqlite_file):
+    with db.db.connection_context():
+        first = Deck.create(name="First")
+        second = Deck.create(name="Second")
+        card = WhiteCard.create(deck=first, text="Card")
+    cache = DeckCache()
+    cache.get([first, second])
+
+    with db.db.connection_context():
+        card = WhiteCard.get_by_id(card.id)
+        card.deck = second
+        card.save()
+    first_cards, second_cards = cache.get([first, second])
+    assert first_cards.white_cards == ()
+    assert [c.text for c in second_cards.white_cards] == ["Card"]
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+from peewee import OperationalError, SqliteDatabase
+
+from cah import db
+from cah.db import Deck, WhiteCard
+
+
+def test_open_database_prefers_url_settings():
+    database = db.open_database("sqlite+pool:///:memory:?max_connections=3", max_connections=10, stale_timeout=60)
+    assert isinstance(database, db.MeteredPooledSqliteDatabase)
+    assert database._max_connections == 3
+    assert database._stale_timeout == 60
+
+
+def test_open_database_without_pool():
+    database = db.open_database("sqlite:///:memory:", max_connections=10)
+    assert type(database) is SqliteDatabase
+    assert "max_connections" not in database.connect_params
+
+
+def test_read_database_is_read_only(sqlite_file):
+    assert db.read_db.obj is not db.db.obj
+    with db.db.connection_context():
+        deck = Deck.create(name="Deck")
+        WhiteCard.create(deck=deck, text="Card")
+
+    with db.reading():
+        assert [c.text for c in WhiteCard.select().bind(db.read_db)] == ["Card"]
+        with pytest.raises(OperationalError):
+            WhiteCard.insert(deck=deck, text="Another").bind(db.read_db).execute()
+
+
+def test_memory_database_is_shared():
+    db.init_db("sqlite+pool:///:memory:")
+    try:
+        assert db.read_db.obj is db.db.obj
+        assert list(db.get_pool_metrics()) == ["db"]
+    finally:
+        db.init_db()
+
+
+def test_reading_keeps_open_connection():
+    db.init_db("sqlite+pool:///:memory:")
+    try:
+        deck = Deck.create(name="Deck")
+        with db.db.atomic():
+            with db.reading():
+                Deck.select().bind(db.read_db).count()
+            assert not db.db.is_closed()
+            Deck.update(name="Renamed").where(Deck.id == deck.id).execute()
+        assert Deck.get_by_id(deck.id).name == "Renamed"
+    finally:
+        db.db.close()
+        db.init_db()
+
+
+def test_pool_metrics(sqlite_file):
+    for _ in range(3):
+        with db.reading():
+            Deck.select().bind(db.read_db).count()
+    metrics = db.get_pool_metrics()["read_db"]
+    assert metrics["checkouts"] == 3
+    assert metrics["returns"] == 3
+    assert metrics["in_use"] == 0
+    assert metrics["idle"] == 1
+    assert metrics["peak_in_use"] == 1
+
+
+@pytest.mark.skipif("POSTGRES_URL" not in os.environ, reason="set DATABASE_URL to a Postgres database")
+def test_postgres():
+    db.init_db(os.environ["POSTGRES_URL"])
+    try:
+        assert isinstance(db.db.obj, db.MeteredPooledPostgresqlDatabase)
+        assert db.read_db.obj is db.db.obj
+        with db.db.connection_context():
+            deck = Deck.create(name="Deck")
+            WhiteCard.create(deck=deck, text="Card")
+        try:
+            with db.reading():
+                assert [c.text for c in WhiteCard.select().where(WhiteCard.deck == deck).bind(db.read_db)] == ["Card"]
+            assert db.get_pool_metrics()["db"]["in_use"] == 0
+        finally:
+            with db.db.connection_context():
+                WhiteCard.delete().where(WhiteCard.deck == deck).execute()
+                deck.delete_instance()
+    finally:
+        db.init_db()
@@ -0,0 +1,111 @@
+import asyncio
+
+from benchmarks.stubs import FakeUser, FakeThread
+from cah.db import WhiteCard, BlackCard
+from cah.game import Game
+
+
+def new_game(players: int, white: int = 1000, black: int = 100) -> Game:
+    game = Game(None, FakeUser(0), FakeThread(), "Game", [])
+    game.deck_white = [WhiteCard(text=f"White {i}") for i in range(white)]
+    game.deck_black = [BlackCard(text=f"Black {i}", white_card_num=1 + i % 3) for i in range(black)]
+    game.max_players = players
+    game.goal_points = 1 << 30
+    game.winner_delay = 0
+    for i in range(players):
+        game.join(FakeUser(i))
+    return game
+
+
+def white_cards(game: Game) -> list[WhiteCard]:
+    cards = game.deck_white + game.deck_white_discard
+    for p in game.get_players():
+        cards += p.cards
+    return cards
+
+
+async def play_round(game: Game):
+    czar = game.get_czar()
+    n = game.black_card.get_white_card_num()
+    for p in game.get_players():
+        if p is not czar:
+            p.round_selected_cards = p.cards[:n]
+    await game.update_round_status()
+    await game.round_winner(next(p for p in game.get_players() if p is not czar))
+
+
+def test_deal_draws_from_the_end_of_the_deck():
+    game = new_game(3)
+    top = game.deck_white[-30:]
+    game.deal_white_cards(game.get_players(), 10)
+    assert len(game.deck_white) == 970
+    assert [c for p in game.get_players() for c in p.cards] == top
+
+
+def test_rounds_keep_hands_full_and_cards_counted():
+    game = new_game(50, white=2000, black=20)
+    cards = {id(c) for c in white_cards(game)}
+
+    async def play():
+        await game.start()
+        for _ in range(30):
+            await play_round(game)
+            assert all(len(p.cards) == 10 for p in game.get_players())
+            assert sorted(id(c) for c in white_cards(game)) == sorted(cards)
+            assert len(game.deck_black) + len(game.deck_black_discard) == 20
+
+    asyncio.run(play())
+    assert game.round == 31
+
+
+def test_czar_is_not_refilled():
+    game = new_game(3)
+
+    async def play():
+        await game.start()
+        czar = game.get_czar()
+        hand = list(czar.cards)
+        await play_round(game)
+        assert czar.cards == hand
+
+    asyncio.run(play())
+
+
+def test_white_deck_recycles_discard():
+    game = new_game(1, white=15)
+    game.deck_white_discard = game.draw_white_cards(10)
+    cards = game.draw_white_cards(8)
+    assert len(cards) == 8
+    assert len(game.deck_white) == 7
+    assert game.deck_white_discard == []
+
+
+def test_white_deck_exhausted():
+    game = new_game(1, white=5)
+    assert len(game.draw_white_cards(8)) == 5
+    assert game.draw_white_cards(1) == []
+
+
+def test_black_deck_recycles_own_discard():
+    game = new_game(1, black=3)
+    drawn = [game.draw_black_card() for _ in range(7)]
+    assert set(map(id, drawn)) == set(map(id, game.deck_black + game.deck_black_discard))
+    assert len(game.deck_black) + len(game.deck_black_discard) == 3
+    assert len(game.deck_white) == 1000
+
+
+def test_reset_returns_every_card():
+    game = new_game(5)
+
+    async def play():
+        await game.start()
+        for _ in range(3):
+            await play_round(game)
+
+    asyncio.run(play())
+    game.reset()
+    assert len(game.deck_white) == 1000
+    assert len(game.deck_black) == 100
+    assert game.deck_white_discard == game.deck_black_discard == []
+    assert all(p.cards == [] and p.points == 0 for p in game.get_players())
+    assert not game.in_progress and game.round == 0
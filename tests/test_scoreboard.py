@@ -0,0 +1,95 @@
+import pytest
+
+from benchmarks.stubs import FakeUser
+from cah.player import Player
+from cah.scoreboard import Scoreboard
+from cah.views import EMBED_FIELD_LIMIT
+
+
+@pytest.fixture
+def scoreboard():
+    return Scoreboard("Game")
+
+
+def join(scoreboard: Scoreboard, *ids: int) -> list[Player]:
+    players = [Player(FakeUser(i), None) for i in ids]
+    for p in players:
+        scoreboard.add(p)
+    return players
+
+
+def ids(scoreboard: Scoreboard) -> list[int]:
+    return [p.user.id for p in scoreboard.standings]
+
+
+def test_orders_by_points_then_join_order(scoreboard):
+    a, b, c, d = join(scoreboard, 4, 3, 2, 1)
+    assert ids(scoreboard) == [4, 3, 2, 1]
+    scoreboard.add_points(c)
+    scoreboard.add_points(a, 2)
+    scoreboard.add_points(d)
+    assert ids(scoreboard) == [4, 2, 1, 3]
+    assert scoreboard.get_leader() is a
+
+
+def test_add_points_moves_player(scoreboard):
+    a, b, c = join(scoreboard, 1, 2, 3)
+    scoreboard.add_points(c)
+    assert ids(scoreboard) == [3, 1, 2]
+    scoreboard.add_points(b)
+    scoreboard.add_points(b)
+    assert ids(scoreboard) == [2, 3, 1]
+    assert [p.points for p in scoreboard.standings] == [2, 1, 0]
+
+
+def test_remove_and_rejoin(scoreboard):
+    a, b, c = join(scoreboard, 1, 2, 3)
+    scoreboard.remove(a)
+    assert ids(scoreboard) == [2, 3]
+    assert 1 not in scoreboard.join_order
+    join(scoreboard, 1)
+    assert ids(scoreboard) == [2, 3, 1]
+    scoreboard.remove(c)
+    assert ids(scoreboard) == [2, 1]
+
+
+def test_reset(scoreboard):
+    a, b, c = join(scoreboard, 1, 2, 3)
+    scoreboard.add_points(c, 3)
+    scoreboard.add_points(b)
+    scoreboard.reset()
+    assert ids(scoreboard) == [1, 2, 3]
+    assert [p.points for p in scoreboard.standings] == [0, 0, 0]
+
+
+def test_changes_clear_the_cache(scoreboard):
+    a, b = join(scoreboard, 1, 2)
+    renders = [(scoreboard.get_standings(), scoreboard.get_player_list(), scoreboard.get_embed())]
+    assert scoreboard.get_embed() is renders[0][2]
+
+    for change in (lambda: scoreboard.add_points(b), lambda: join(scoreboard, 3), lambda: scoreboard.remove(a),
+                   scoreboard.reset):
+        change()
+        assert scoreboard._standings_render is None
+        assert scoreboard._players_render is None
+        assert scoreboard._embed is None
+        renders.append((scoreboard.get_standings(), scoreboard.get_player_list(), scoreboard.get_embed()))
+
+    assert [r[0] for r in renders] == [
+        "<@1>: 0\n<@2>: 0",
+        "<@2>: 1\n<@1>: 0",
+        "<@2>: 1\n<@1>: 0\n<@3>: 0",
+        "<@2>: 1\n<@3>: 0",
+        "<@2>: 0\n<@3>: 0",
+    ]
+    assert renders[-1][2].fields[0].value == renders[-1][0]
+
+
+def test_renders_fit_into_a_field(scoreboard):
+    players = join(scoreboard, *range(10 ** 17, 10 ** 17 + 100))
+    for p in players:
+        p.user.display_name = "x" * 32
+    scoreboard.invalidate()
+    for text in (scoreboard.get_standings(), scoreboard.get_player_list()):
+        assert len(text) <= EMBED_FIELD_LIMIT
+        assert text.endswith("more")
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from benchmarks.stubs import FakeUser, FakeThread
+from cah.db import WhiteCard, BlackCard
+from cah.game import Game, DEFAULT_MAX_PLAYERS
+from cah.views import JoinGameView, StartCardSelectView, SelectCardView, CzarPickWinnerView, WinnerAnnouncedView, \
+    EMBED_FIELD_LIMIT, EMBED_FOOTER_LIMIT, EMBED_DESCRIPTION_LIMIT
+
+
+def check_embed(embed):
+    assert len(embed) <= 6000
+    assert len(embed.description or "") <= EMBED_DESCRIPTION_LIMIT
+    assert len(embed.footer.text if embed.footer else "") <= EMBED_FOOTER_LIMIT
+    for field in embed.fields:
+        assert len(field.value) <= EMBED_FIELD_LIMIT
+
+
+@pytest.mark.parametrize("players", [DEFAULT_MAX_PLAYERS, 100])
+def test_embeds_fit_at_the_cap(players):
+    async def build():
+        game = Game(None, FakeUser(0), FakeThread(), "x" * 100, [])
+        game.deck_white = [WhiteCard(text="w" * 255) for _ in range(players * 12)]
+        game.deck_black = [BlackCard(text="b" * 255, white_card_num=3)]
+        game.max_players = players
+        for i in range(players):
+            user = FakeUser(10 ** 17 + i)
+            user.display_name = "n" * 32
+            game.join(user)
+        await game.start()
+
+        views = [JoinGameView(game), StartCardSelectView(game)]
+        others = [p for p in game.get_players() if p is not game.get_czar()]
+        views.append(SelectCardView(others[0], game.black_card))
+        for p in others:
+            p.round_selected_cards = p.cards[:3]
+        views += [CzarPickWinnerView(game), WinnerAnnouncedView(others[0])]
+        for view in views:
+            check_embed(view.get_embed())
+
+    asyncio.run(build())